@@ -21,6 +21,7 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = ""
+    db_checkpoint_interval_sec: int = 300  # periodic WAL checkpoint; 0 disables
 
     # Transcription
     assemblyai_api_key: str = ""  # Get free key at https://www.assemblyai.com/
@@ -1,32 +1,256 @@
 """SQLAlchemy database setup with SQLite."""
 
-from sqlalchemy import create_engine
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import orjson
+from sqlalchemy import create_engine, event, inspect, make_url, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},  # SQLite-specific
-    echo=settings.debug,
-)
+logger = logging.getLogger(__name__)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# writer, and synchronous=NORMAL is durable enough in WAL mode with far fewer fsyncs.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA foreign_keys=ON",
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    """FastAPI dependency that yields a database session."""
-    db = SessionLocal()
+def _is_file_sqlite(url) -> bool:
+    """True for on-disk SQLite URLs (pragmas are pointless for :memory:)."""
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
     try:
-        yield db
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
     finally:
-        db.close()
+        cursor.close()
+
+
+def configure_engine(db_engine):
+    """Attach the SQLite connection pragmas to an engine (sync or async)."""
+    if _is_file_sqlite(db_engine.url):
+        event.listen(getattr(db_engine, "sync_engine", db_engine), "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+# JSON columns (key_points, action_items) go through orjson
+_JSON_ENGINE_KWARGS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
+
+def _async_url(url: str):
+    """The async-driver flavour of a database URL (aiosqlite for SQLite)."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def _create_async_engine(pool_size: int, max_overflow: int):
+    return configure_engine(
+        create_async_engine(
+            _async_url(settings.database_url),
+            echo=settings.debug,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            **_JSON_ENGINE_KWARGS,
+        )
+    )
+
+
+# Sync engine: schema setup, maintenance and the background processing worker
+engine = configure_engine(
+    create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False},  # SQLite-specific
+        echo=settings.debug,
+        **_JSON_ENGINE_KWARGS,
+    )
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engines for request handlers. SQLite allows a single writer at a time,
+# so writes go through one pooled connection while reads (concurrent under WAL)
+# get their own pool.
+async_write_engine = _create_async_engine(pool_size=1, max_overflow=0)
+async_read_engine = _create_async_engine(pool_size=10, max_overflow=5)
+
+AsyncWriteSessionLocal = async_sessionmaker(
+    async_write_engine, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+_write_lock = asyncio.Lock()
+
+
+async def get_db_read():
+    """FastAPI dependency that yields an async session for read queries."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def async_write_session():
+    """Hold the writer lock and yield the async writer session."""
+    async with _write_lock:
+        async with AsyncWriteSessionLocal() as db:
+            yield db
+
+
+async def get_db_write():
+    """FastAPI dependency that yields the (serialized) async writer session."""
+    async with async_write_session() as db:
+        yield db
+
+
+async def close_db():
+    """Dispose the async connection pools (run on shutdown)."""
+    await async_read_engine.dispose()
+    await async_write_engine.dispose()
+
+
+# External-content FTS5 index over sessions(title, transcript), kept in sync by triggers
+_FTS_TABLE_DDL = (
+    "CREATE VIRTUAL TABLE sessions_fts USING fts5("
+    "title, transcript, content='sessions', content_rowid='rowid')"
+)
+_FTS_TRIGGERS_DDL = (
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_ai AFTER INSERT ON sessions BEGIN
+        INSERT INTO sessions_fts(rowid, title, transcript)
+        VALUES (new.rowid, new.title, new.transcript);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_ad AFTER DELETE ON sessions BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, title, transcript)
+        VALUES ('delete', old.rowid, old.title, old.transcript);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_au AFTER UPDATE OF title, transcript ON sessions
+    BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, title, transcript)
+        VALUES ('delete', old.rowid, old.title, old.transcript);
+        INSERT INTO sessions_fts(rowid, title, transcript)
+        VALUES (new.rowid, new.title, new.transcript);
+    END""",
+)
+
+_fts_enabled = False
+
+
+def fts_enabled() -> bool:
+    """Whether the full-text search index is available (set by init_db)."""
+    return _fts_enabled
+
+
+def _init_fts(conn):
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions_fts'")
+    ).first()
+    if not exists:
+        conn.execute(text(_FTS_TABLE_DDL))
+        # Index any rows that predate the FTS table
+        conn.execute(text("INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')"))
+    for ddl in _FTS_TRIGGERS_DDL:
+        conn.execute(text(ddl))
+
+
+def _add_missing_columns():
+    """Add nullable columns introduced after a table was first created.
+
+    create_all never alters existing tables; this covers simple additive
+    schema changes without a migration tool.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {col["name"] for col in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {col_type}')
+                )
+                logger.info(f"Added column {table.name}.{column.name}")
 
 
 def init_db():
-    """Create all tables."""
+    """Create all tables, indexes and the full-text search index."""
+    global _fts_enabled
+
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    if engine.url.get_backend_name() != "sqlite":
+        _fts_enabled = False
+        return
+    try:
+        with engine.begin() as conn:
+            _init_fts(conn)
+        _fts_enabled = True
+    except OperationalError as e:
+        logger.warning(f"SQLite FTS5 unavailable, search falls back to LIKE: {e}")
+        _fts_enabled = False
+
+
+def fail_interrupted_sessions() -> int:
+    """Mark sessions left mid-pipeline by a previous run as errored.
+
+    Processing runs as an in-process background task, so nothing resumes it
+    after a restart; without this, clients would poll those sessions forever.
+    Returns the number of sessions updated.
+    """
+    with engine.begin() as conn:
+        result = conn.execute(
+            text(
+                "UPDATE sessions SET status = 'error', error_message = :message "
+                "WHERE status NOT IN ('completed', 'error')"
+            ),
+            {"message": "Processing was interrupted by a server restart. Please upload again."},
+        )
+    return result.rowcount
+
+
+def checkpoint_wal():
+    """Fold the WAL back into the main database file and truncate it."""
+    if not _is_file_sqlite(engine.url):
+        return
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+
+def optimize_db():
+    """Let SQLite refresh query planner statistics (run on shutdown)."""
+    if not _is_file_sqlite(engine.url):
+        return
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA optimize"))
@@ -1,15 +1,25 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
-from app.database import init_db
+from app.database import (
+    checkpoint_wal,
+    close_db,
+    fail_interrupted_sessions,
+    init_db,
+    optimize_db,
+)
 from app.routers import sessions
 from app.schemas import HealthResponse
+from app.services.summarization import shutdown_executor
+from app.services.transcription import close_client
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +30,16 @@ logger = logging.getLogger(__name__)
 
 
 # ── Lifespan ─────────────────────────────────────────────────
+async def _checkpoint_loop(interval_sec: int):
+    """Periodically truncate the SQLite WAL so it doesn't grow unbounded."""
+    while True:
+        await asyncio.sleep(interval_sec)
+        try:
+            await asyncio.to_thread(checkpoint_wal)
+        except Exception as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
@@ -28,8 +48,27 @@ async def lifespan(app: FastAPI):
     logger.info(f"Transcription: {'mock' if settings.mock_mode else 'AssemblyAI'}")
     init_db()
     logger.info("Database initialized.")
+    interrupted = fail_interrupted_sessions()
+    if interrupted:
+        logger.warning(f"Marked {interrupted} interrupted session(s) as errored.")
+
+    checkpoint_task = None
+    if settings.db_checkpoint_interval_sec > 0:
+        checkpoint_task = asyncio.create_task(_checkpoint_loop(settings.db_checkpoint_interval_sec))
+
     yield  # ← app is running
+
     logger.info("Shutting down.")
+    if checkpoint_task:
+        checkpoint_task.cancel()
+    try:
+        checkpoint_wal()
+        optimize_db()
+    except Exception as e:
+        logger.warning(f"Database shutdown maintenance failed: {e}")
+    await close_db()
+    await close_client()
+    shutdown_executor()
 
 
 # Create app
@@ -40,6 +79,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
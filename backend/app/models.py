@@ -1,10 +1,9 @@
 """SQLAlchemy ORM models."""
 
-import json
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, Index, Integer, String, Text
 
 from app.database import Base
 
@@ -21,11 +20,17 @@ class Session(Base):
     """A voice recording session with transcript and summary."""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Newest-first listing, with and without a status filter
+        Index("ix_sessions_status_created", "status", "created_at", "id"),
+        Index("ix_sessions_created", "created_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=_generate_uuid)
     title = Column(String(255), nullable=False, default="Untitled Session")
     audio_filename = Column(String(255), nullable=True)
     audio_duration = Column(Float, nullable=True)  # seconds
+    content_sha256 = Column(String(64), nullable=True, index=True)  # dedups re-uploads
     status = Column(
         String(20), nullable=False, default="uploading"
     )  # uploading | transcribing | summarizing | completed | error
@@ -34,8 +39,8 @@ class Session(Base):
     # Content
     transcript = Column(Text, nullable=True)
     summary = Column(Text, nullable=True)
-    key_points = Column(Text, nullable=True)  # JSON list
-    action_items = Column(Text, nullable=True)  # JSON list
+    key_points = Column(JSON, nullable=True)  # list[str]
+    action_items = Column(JSON, nullable=True)  # list[str]
 
     # Metadata
     language = Column(String(10), nullable=True)
@@ -44,22 +49,6 @@ class Session(Base):
     created_at = Column(DateTime, default=_utcnow)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
 
-    def get_key_points(self) -> list[str]:
-        if self.key_points:
-            return json.loads(self.key_points)
-        return []
-
-    def set_key_points(self, points: list[str]):
-        self.key_points = json.dumps(points)
-
-    def get_action_items(self) -> list[str]:
-        if self.action_items:
-            return json.loads(self.action_items)
-        return []
-
-    def set_action_items(self, items: list[str]):
-        self.action_items = json.dumps(items)
-
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -70,8 +59,8 @@ class Session(Base):
             "error_message": self.error_message,
             "transcript": self.transcript,
             "summary": self.summary,
-            "key_points": self.get_key_points(),
-            "action_items": self.get_action_items(),
+            "key_points": self.key_points or [],
+            "action_items": self.action_items or [],
             "language": self.language,
             "word_count": self.word_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -1,5 +1,7 @@
 """Session API endpoints: upload, list, get, delete, re-summarize."""
 
+import asyncio
+import hashlib
 import json
 import logging
 import shutil
@@ -7,11 +9,23 @@ import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from sqlalchemy.orm import Session as DBSession
+import aiofiles
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.config import settings
-from app.database import get_db
+from app.database import async_write_session, fts_enabled, get_db_read, get_db_write
 from app.models import Session
 from app.schemas import (
     ResummarizeRequest,
@@ -19,29 +33,50 @@ from app.schemas import (
     SessionListResponse,
     SessionResponse,
 )
-from app.services.audio import get_audio_duration, validate_audio_file
+from app.services.audio import get_audio_duration_from_bytes, validate_audio_file
+from app.services.processing import process_session
 from app.services.summarization import summarize_transcript
-from app.services.transcription import transcribe_audio
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+UPLOAD_HEADER_BYTES = 1024 * 1024  # kept in memory to read the duration from
+
+# Copied from an earlier session when the same audio is uploaded again
+_REUSABLE_FIELDS = (
+    "title",
+    "audio_duration",
+    "transcript",
+    "summary",
+    "key_points",
+    "action_items",
+    "language",
+    "word_count",
+)
+
 
-@router.post("", response_model=SessionResponse, status_code=201)
+@router.post(
+    "",
+    response_model=SessionResponse,
+    status_code=202,
+    responses={201: {"model": SessionResponse, "description": "Duplicate upload; results reused"}},
+)
 async def create_session(
+    background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(...),
-    db: DBSession = Depends(get_db),
 ):
     """
-    Upload an audio file, transcribe it, and generate a summary.
+    Upload an audio file and queue it for transcription and summarization.
 
-    This endpoint handles the full pipeline:
-    1. Validate and save the uploaded audio file
-    2. Transcribe using Whisper (or mock mode)
-    3. Summarize the transcript
-    4. Store everything in the database
+    The file is validated and saved, a session record is created, and the
+    pipeline (transcribe → summarize) runs as a background task. The session
+    is returned immediately with status "uploading"; poll
+    GET /api/sessions/{id} until it reaches "completed" or "error".
 
-    Returns the complete session with transcript and summary.
+    If the exact same audio was already processed, its results are copied
+    into the new session and it is returned completed (201) straight away.
     """
     # Validate file type
     if not file.filename or not validate_audio_file(file.filename):
@@ -50,104 +85,115 @@ async def create_session(
             detail=f"Unsupported audio format. Supported: mp3, wav, ogg, webm, m4a, flac, mp4",
         )
 
-    # Check file size (read content to check)
-    contents = await file.read()
-    size_mb = len(contents) / (1024 * 1024)
-    if size_mb > settings.max_file_size_mb:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large ({size_mb:.1f}MB). Max allowed: {settings.max_file_size_mb}MB.",
-        )
-
-    # Create session record
+    # Stream the upload to disk, enforcing the size limit as we go
     session_id = str(uuid.uuid4())
     ext = Path(file.filename).suffix
     audio_filename = f"{session_id}{ext}"
     audio_path = str(settings.upload_dir / audio_filename)
 
+    size, content_sha256, header = await _save_upload(file, audio_path)
+    duration = get_audio_duration_from_bytes(header, ext, total_size=size)
+
     session = Session(
         id=session_id,
         audio_filename=audio_filename,
+        audio_duration=duration or None,
+        content_sha256=content_sha256,
         status="uploading",
     )
-    db.add(session)
-    db.commit()
-
-    try:
-        # Save file
-        with open(audio_path, "wb") as f:
-            f.write(contents)
-
-        # Get duration
-        session.audio_duration = get_audio_duration(audio_path)
-
-        # ── Transcribe ───────────────────────────────────
-        session.status = "transcribing"
-        db.commit()
-
-        result = transcribe_audio(audio_path)
-        session.transcript = result["text"]
-        session.language = result.get("language", "en")
-        session.word_count = len(result["text"].split()) if result["text"] else 0
-
-        # ── Summarize ────────────────────────────────────
-        session.status = "summarizing"
-        db.commit()
-
-        summary_result = summarize_transcript(result["text"])
-        session.summary = summary_result["summary"]
-        session.set_key_points(summary_result["key_points"])
-        session.set_action_items(summary_result["action_items"])
-
-        # Auto-generate title from first sentence of transcript
-        if result["text"]:
-            first_words = " ".join(result["text"].split()[:8])
-            session.title = first_words + ("..." if len(result["text"].split()) > 8 else "")
-        else:
-            session.title = f"Session {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')}"
 
-        session.status = "completed"
-        session.updated_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(session)
-
-    except Exception as e:
-        logger.error(f"Processing failed for session {session_id}: {e}")
-        session.status = "error"
-        session.error_message = str(e)
-        db.commit()
-        db.refresh(session)
+    # The writer is taken only now, after the slow streaming and hashing
+    async with async_write_session() as db:
+        # Same bytes already transcribed: reuse the results instead of reprocessing
+        previous = await db.scalar(
+            select(Session)
+            .where(Session.content_sha256 == content_sha256, Session.status == "completed")
+            .limit(1)
+        )
+        if previous:
+            logger.info(f"Upload matches session {previous.id}; reusing its results.")
+            for field in _REUSABLE_FIELDS:
+                setattr(session, field, getattr(previous, field))
+            session.status = "completed"
+            response.status_code = 201
+
+        db.add(session)
+        await db.commit()
+        # Reload the defaulted timestamps as stored, so this response formats
+        # them exactly like GET does (SQLite hands back naive UTC)
+        await db.refresh(session, attribute_names=["created_at", "updated_at"])
+
+    if not previous:
+        background_tasks.add_task(process_session, session_id, audio_path, duration or None)
 
     return _session_to_response(session)
 
 
 @router.get("", response_model=SessionListResponse)
-def list_sessions(
+async def list_sessions(
     search: str | None = Query(None, description="Search in title/transcript"),
     status: str | None = Query(None, description="Filter by status"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: DBSession = Depends(get_db),
+    after_created_at: datetime | None = Query(
+        None, description="Keyset cursor: created_at of the last session already seen"
+    ),
+    after_id: str | None = Query(None, description="Keyset cursor: id of that session"),
+    db: AsyncSession = Depends(get_db_read),
 ):
-    """List all sessions with optional search and pagination."""
-    query = db.query(Session)
+    """List all sessions with optional search and pagination.
+
+    Pages by offset (``page``) by default. Passing ``after_created_at`` and
+    ``after_id`` from the last item of the previous page switches to keyset
+    pagination, which stays fast however deep the page is.
+    """
+    filters = []
 
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (Session.title.ilike(search_filter)) | (Session.transcript.ilike(search_filter))
-        )
+        if fts_enabled():
+            fts_query = _fts_query(search)
+            if fts_query:
+                filters.append(
+                    text(
+                        "sessions.rowid IN "
+                        "(SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH :q)"
+                    ).bindparams(q=fts_query)
+                )
+        else:
+            search_filter = f"%{search}%"
+            filters.append(
+                (Session.title.ilike(search_filter)) | (Session.transcript.ilike(search_filter))
+            )
 
     if status:
-        query = query.filter(Session.status == status)
-
-    total = query.count()
-    sessions = (
-        query.order_by(Session.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+        filters.append(Session.status == status)
+
+    total = await db.scalar(select(func.count()).select_from(Session).where(*filters))
+
+    # Only the columns SessionListItem needs; skips transcript/summary text
+    query = (
+        select(Session)
+        .options(
+            load_only(
+                Session.id,
+                Session.title,
+                Session.audio_duration,
+                Session.status,
+                Session.language,
+                Session.word_count,
+                Session.created_at,
+            )
+        )
+        .where(*filters)
+        .order_by(Session.created_at.desc(), Session.id.desc())
     )
+    if after_created_at is not None and after_id is not None:
+        query = query.where(
+            tuple_(Session.created_at, Session.id) < tuple_(after_created_at, after_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    sessions = (await db.scalars(query.limit(page_size))).all()
 
     return SessionListResponse(
         sessions=[
@@ -169,18 +215,18 @@ def list_sessions(
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
-def get_session(session_id: str, db: DBSession = Depends(get_db)):
+async def get_session(session_id: str, db: AsyncSession = Depends(get_db_read)):
     """Get a single session by ID."""
-    session = db.query(Session).filter(Session.id == session_id).first()
+    session = await db.get(Session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return _session_to_response(session)
 
 
 @router.delete("/{session_id}", status_code=204)
-def delete_session(session_id: str, db: DBSession = Depends(get_db)):
+async def delete_session(session_id: str, db: AsyncSession = Depends(get_db_write)):
     """Delete a session and its audio file."""
-    session = db.query(Session).filter(Session.id == session_id).first()
+    session = await db.get(Session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -190,38 +236,87 @@ def delete_session(session_id: str, db: DBSession = Depends(get_db)):
         if audio_path.exists():
             audio_path.unlink()
 
-    db.delete(session)
-    db.commit()
+    await db.delete(session)
+    await db.commit()
 
 
 @router.post("/{session_id}/resummarize", response_model=SessionResponse)
-def resummarize_session(
+async def resummarize_session(
     session_id: str,
     body: ResummarizeRequest,
-    db: DBSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_read),
 ):
     """Re-run summarization on an existing session with different settings."""
-    session = db.query(Session).filter(Session.id == session_id).first()
+    session = await db.get(Session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if not session.transcript:
+    transcript = session.transcript
+    if not transcript:
         raise HTTPException(status_code=400, detail="No transcript available to summarize")
 
+    # Summarize without holding the writer; it is only needed for the UPDATE
     try:
-        result = summarize_transcript(session.transcript, num_sentences=body.sentence_count)
-        session.summary = result["summary"]
-        session.set_key_points(result["key_points"])
-        session.set_action_items(result["action_items"])
-        session.updated_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(session)
+        result = await asyncio.to_thread(
+            summarize_transcript, transcript, num_sentences=body.sentence_count
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Summarization failed: {e}")
 
+    async with async_write_session() as write_db:
+        session = await write_db.get(Session, session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        session.summary = result["summary"]
+        session.key_points = result["key_points"]
+        session.action_items = result["action_items"]
+        session.updated_at = datetime.now(timezone.utc)
+        await write_db.commit()
+        # Reload updated_at as stored so it is formatted like created_at and GET
+        await write_db.refresh(session, attribute_names=["updated_at"])
+
     return _session_to_response(session)
 
 
+async def _save_upload(file: UploadFile, audio_path: str) -> tuple[int, str, bytes]:
+    """Write an upload to disk in chunks.
+
+    Returns the size in bytes, the SHA-256 hex digest of the content and the
+    first UPLOAD_HEADER_BYTES of it (enough for container headers).
+    Raises 413 (and removes the partial file) if the size limit is exceeded.
+    """
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+    total = 0
+    digest = hashlib.sha256()
+    header = bytearray()
+    try:
+        async with aiofiles.open(audio_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Max allowed: {settings.max_file_size_mb}MB.",
+                    )
+                digest.update(chunk)
+                if len(header) < UPLOAD_HEADER_BYTES:
+                    header += chunk[: UPLOAD_HEADER_BYTES - len(header)]
+                await f.write(chunk)
+    except BaseException:
+        Path(audio_path).unlink(missing_ok=True)
+        raise
+    return total, digest.hexdigest(), bytes(header)
+
+
+def _fts_query(search: str) -> str:
+    """Turn free-text input into an FTS5 query: every word must prefix-match.
+
+    Each word is quoted so user input can't inject FTS syntax.
+    """
+    terms = (word.replace('"', '""') for word in search.split())
+    return " ".join(f'"{term}"*' for term in terms)
+
+
 def _session_to_response(session: Session) -> SessionResponse:
     """Convert ORM Session to Pydantic response."""
     return SessionResponse(
@@ -233,8 +328,8 @@ def _session_to_response(session: Session) -> SessionResponse:
         error_message=session.error_message,
         transcript=session.transcript,
         summary=session.summary,
-        key_points=session.get_key_points(),
-        action_items=session.get_action_items(),
+        key_points=session.key_points or [],
+        action_items=session.action_items or [],
         language=session.language,
         word_count=session.word_count,
         created_at=session.created_at,
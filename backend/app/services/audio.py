@@ -1,9 +1,11 @@
 """Audio processing utilities: duration, format conversion, chunking.
 
-Uses subprocess + ffprobe/ffmpeg for audio operations to avoid
-pydub's audioop dependency issue on Python 3.13.
+Durations are read from container headers with mutagen where possible;
+everything else uses subprocess + ffprobe/ffmpeg to avoid pydub's
+audioop dependency issue on Python 3.13.
 """
 
+import io
 import json
 import logging
 import math
@@ -12,11 +14,16 @@ import subprocess
 import wave
 from pathlib import Path
 
+import mutagen
+
 logger = logging.getLogger(__name__)
 
 # Supported audio formats
 SUPPORTED_FORMATS = {".mp3", ".wav", ".ogg", ".webm", ".m4a", ".flac", ".mp4", ".mpeg", ".wma"}
 
+# Formats whose header states the full length, so a truncated prefix is enough
+HEADER_DURATION_FORMATS = {".wav", ".flac"}
+
 # Check if ffmpeg/ffprobe are available
 _FFMPEG = shutil.which("ffmpeg")
 _FFPROBE = shutil.which("ffprobe")
@@ -30,7 +37,22 @@ def validate_audio_file(filename: str) -> bool:
 
 def get_audio_duration(file_path: str) -> float:
     """Get audio duration in seconds."""
-    # Try ffprobe first (works for any format)
+    # Read the container header in-process (no subprocess for common formats)
+    try:
+        audio = mutagen.File(file_path)
+        if audio is not None and audio.info.length > 0:
+            return float(audio.info.length)
+    except Exception as e:
+        logger.debug(f"mutagen duration failed: {e}")
+
+    # Fallback for WAV files
+    try:
+        with wave.open(file_path, "rb") as wf:
+            return wf.getnframes() / float(wf.getframerate())
+    except Exception as e:
+        logger.debug(f"wave duration failed: {e}")
+
+    # Last resort: ffprobe (works for any format)
     if _FFPROBE:
         try:
             result = subprocess.run(
@@ -38,7 +60,7 @@ def get_audio_duration(file_path: str) -> float:
                     _FFPROBE, "-v", "quiet", "-print_format", "json",
                     "-show_format", file_path,
                 ],
-                capture_output=True, text=True, timeout=10,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10,
             )
             if result.returncode == 0:
                 info = json.loads(result.stdout)
@@ -46,13 +68,36 @@ def get_audio_duration(file_path: str) -> float:
         except Exception as e:
             logger.debug(f"ffprobe duration failed: {e}")
 
-    # Fallback for WAV files
+    logger.warning(f"Could not determine audio duration: {file_path}")
+    return 0.0
+
+
+def get_audio_duration_from_bytes(
+    data: bytes, ext: str, total_size: int | None = None
+) -> float:
+    """
+    Get audio duration in seconds from in-memory file content.
+
+    Args:
+        data: The file content, or a prefix of it.
+        ext: File extension (e.g. ".wav").
+        total_size: Full file size when ``data`` is only a prefix. Prefixes are
+            only trusted for formats that declare their length in the header.
+
+    Returns:
+        Duration in seconds, or 0.0 if it can't be determined from ``data``.
+    """
+    truncated = total_size is not None and total_size > len(data)
+    if truncated and ext.lower() not in HEADER_DURATION_FORMATS:
+        return 0.0
+
     try:
-        with wave.open(file_path, "rb") as wf:
-            return wf.getnframes() / float(wf.getframerate())
+        audio = mutagen.File(io.BytesIO(data))
+        if audio is not None and audio.info.length > 0:
+            return float(audio.info.length)
     except Exception as e:
-        logger.warning(f"Could not determine audio duration: {e}")
-        return 0.0
+        logger.debug(f"mutagen duration from bytes failed: {e}")
+    return 0.0
 
 
 def convert_to_wav(input_path: str, output_path: str | None = None) -> str:
@@ -102,30 +147,31 @@ def chunk_audio(file_path: str, chunk_duration_sec: int = 300) -> list[str]:
         return [file_path]
 
     num_chunks = math.ceil(duration / chunk_duration_sec)
-    chunk_paths = []
     base = Path(file_path)
+    chunk_glob = f"{base.stem}_chunk*.wav"
 
-    for i in range(num_chunks):
-        start = i * chunk_duration_sec
-        chunk_path = str(base.parent / f"{base.stem}_chunk{i}.wav")
-        try:
-            subprocess.run(
-                [
-                    _FFMPEG, "-y", "-i", file_path,
-                    "-ss", str(start), "-t", str(chunk_duration_sec),
-                    "-ar", "16000", "-ac", "1", "-f", "wav", chunk_path,
-                ],
-                capture_output=True, timeout=120, check=True,
-            )
-            chunk_paths.append(chunk_path)
-            logger.info(f"Created chunk {i+1}/{num_chunks}: {chunk_path}")
-        except Exception as e:
-            logger.error(f"Chunking failed at segment {i}: {e}")
-            # If partial chunks exist, use them; otherwise fall back to original
-            if not chunk_paths:
-                return [file_path]
-            break
+    # One decode pass: the segment muxer writes every chunk as it goes
+    try:
+        subprocess.run(
+            [
+                _FFMPEG, "-y", "-i", file_path, "-vn", "-sn",
+                "-ar", "16000", "-ac", "1",
+                "-f", "segment", "-segment_time", str(chunk_duration_sec),
+                "-segment_format", "wav", "-reset_timestamps", "1",
+                str(base.parent / f"{base.stem}_chunk%03d.wav"),
+            ],
+            capture_output=True, timeout=120 * num_chunks, check=True,
+        )
+    except Exception as e:
+        logger.error(f"Chunking failed: {e}")
+        cleanup_chunks([str(p) for p in base.parent.glob(chunk_glob)], file_path)
+        return [file_path]
+
+    chunk_paths = sorted(str(p) for p in base.parent.glob(chunk_glob))
+    if not chunk_paths:
+        return [file_path]
 
+    logger.info(f"Created {len(chunk_paths)} chunks for {file_path}")
     return chunk_paths
 
 
@@ -0,0 +1,93 @@
+"""Background processing pipeline: transcribe and summarize an uploaded session.
+
+Runs on the event loop after the upload request has returned: waiting on the
+transcription service blocks nothing, and CPU-bound steps go to a thread.
+Each write takes the writer session briefly, so no connection is held during
+transcription.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from app import database
+from app.models import Session
+from app.services.audio import get_audio_duration
+from app.services.summarization import summarize_transcript
+from app.services.transcription import transcribe_audio_async
+
+logger = logging.getLogger(__name__)
+
+
+class SessionGoneError(Exception):
+    """The session row was deleted while it was being processed."""
+
+
+@asynccontextmanager
+async def _session_update(session_id: str):
+    """Load a session, yield it for modification, and commit on exit."""
+    async with database.async_write_session() as db:
+        session = await db.get(Session, session_id)
+        if session is None:
+            raise SessionGoneError(session_id)
+        yield session
+        await db.commit()
+
+
+async def process_session(session_id: str, audio_path: str, audio_duration: float | None = None):
+    """
+    Run the full pipeline for an uploaded session.
+
+    Status moves to transcribing (committed so pollers see progress during
+    the slow step), then transcript, summary and completed status are written
+    together in one final commit — or error if any step fails. Clients poll
+    GET /api/sessions/{id} for progress.
+
+    ``audio_duration`` is probed from the file unless the upload handler
+    already determined it.
+    """
+    try:
+        if audio_duration is None:
+            audio_duration = await asyncio.to_thread(get_audio_duration, audio_path)
+        async with _session_update(session_id) as session:
+            session.audio_duration = audio_duration
+            session.status = "transcribing"
+
+        # ── Transcribe ───────────────────────────────────
+        result = await transcribe_audio_async(audio_path)
+
+        # ── Summarize ────────────────────────────────────
+        summary_result = await asyncio.to_thread(summarize_transcript, result["text"])
+
+        words = result["text"].split() if result["text"] else []
+
+        async with _session_update(session_id) as session:
+            session.transcript = result["text"]
+            session.language = result.get("language", "en")
+            session.word_count = len(words)
+
+            session.summary = summary_result["summary"]
+            session.key_points = summary_result["key_points"]
+            session.action_items = summary_result["action_items"]
+
+            # Auto-generate title from first sentence of transcript
+            if words:
+                session.title = " ".join(words[:8]) + ("..." if len(words) > 8 else "")
+            else:
+                session.title = f"Session {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')}"
+
+            session.status = "completed"
+            session.updated_at = datetime.now(timezone.utc)
+
+    except SessionGoneError:
+        logger.info(f"Session {session_id} was deleted during processing; stopping.")
+
+    except Exception as e:
+        logger.error(f"Processing failed for session {session_id}: {e}")
+        try:
+            async with _session_update(session_id) as session:
+                session.status = "error"
+                session.error_message = str(e)
+        except SessionGoneError:
+            pass
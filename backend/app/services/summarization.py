@@ -5,14 +5,22 @@ Provides: summary, key points, and action item extraction.
 This is a simple, fast, deterministic approach — no heavy ML models needed.
 """
 
+import hashlib
 import logging
+import multiprocessing
+import os
 import re
-from collections import Counter
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 # Common English stop words
-STOP_WORDS = set(
+STOP_WORDS = frozenset(
     "i me my myself we our ours ourselves you your yours yourself yourselves "
     "he him his himself she her hers herself it its itself they them their "
     "theirs themselves what which who whom this that these those am is are was "
@@ -44,61 +52,142 @@ ACTION_PATTERNS = [
     r"\bmake sure\b(.*?)(?:\.|$)",
 ]
 
+# Compiled once at import: all action patterns fused into a single alternation
+_ACTION_RE = re.compile("|".join(f"(?:{p})" for p in ACTION_PATTERNS), re.IGNORECASE)
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"\b[a-z]+\b")
+
+# Map-reduce segments are summarized in worker processes only when there are
+# enough of them to outweigh the IPC cost (each segment takes well under 1 ms)
+# and at least two CPUs to run them on.
+_PARALLEL_MIN_SEGMENTS = 32
+
+
+def _usable_cpus() -> int:
+    """CPUs this process may run on (respects affinity / container cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS / Windows
+        return os.cpu_count() or 1
+
+
+_POOL_WORKERS = min(_usable_cpus(), 4)
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+# LRU of sentence scores, keyed on a digest of the sentence list
+_SCORE_CACHE_SIZE = 128
+_score_cache: OrderedDict[bytes, list[float]] = OrderedDict()
+_score_cache_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Lazily start the shared summarization process pool."""
+    global _executor
+    if _executor is None:
+        # Background tasks run on several threads; only one may start the pool
+        with _executor_lock:
+            if _executor is None:
+                # spawn: forking a multi-threaded server process is unsafe
+                _executor = ProcessPoolExecutor(
+                    max_workers=_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the summarization process pool, if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
 
 def _split_sentences(text: str) -> list[str]:
     """Split text into sentences."""
     # Simple sentence splitting on . ! ? followed by space or end
-    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    # Pieces come out already stripped: the text is stripped once and the
+    # split consumes the whitespace between sentences
+    sentences = _SENT_SPLIT_RE.split(text.strip())
     # Filter out very short sentences
-    return [s.strip() for s in sentences if len(s.strip()) > 10]
+    return [s for s in sentences if len(s) > 10]
 
 
 def _score_sentences(sentences: list[str]) -> list[tuple[float, int, str]]:
-    """Score sentences by word importance (TF-based)."""
-    # Build word frequency from all sentences
-    all_words = []
-    for sentence in sentences:
-        words = re.findall(r"\b[a-z]+\b", sentence.lower())
-        all_words.extend(w for w in words if w not in STOP_WORDS and len(w) > 2)
+    """Score sentences by word importance (TF-based).
 
-    word_freq = Counter(all_words)
-    if not word_freq:
+    A sentence's score is the summed normalized frequency of its content words
+    divided by its total word count. Tokens are mapped to vocabulary ids once,
+    then frequencies and per-sentence sums are computed with NumPy.
+    """
+    vocab: dict[str, int] = {}
+    token_ids: list[int] = []  # content-word ids, flattened across sentences
+    token_sentence: list[int] = []  # sentence index for each entry in token_ids
+    lengths = np.zeros(len(sentences))
+
+    for i, sentence in enumerate(sentences):
+        words = _WORD_RE.findall(sentence.lower())
+        lengths[i] = len(words)
+        for w in words:
+            if w not in STOP_WORDS and len(w) > 2:
+                token_ids.append(vocab.setdefault(w, len(vocab)))
+                token_sentence.append(i)
+
+    if not token_ids:
         return [(0.0, i, s) for i, s in enumerate(sentences)]
 
-    max_freq = max(word_freq.values())
+    ids = np.asarray(token_ids)
+    word_freq = np.bincount(ids).astype(np.float64)
+    word_freq /= word_freq.max()
 
-    # Normalize frequencies
-    for word in word_freq:
-        word_freq[word] /= max_freq
+    totals = np.bincount(token_sentence, weights=np.take(word_freq, ids), minlength=len(sentences))
+    scores = np.divide(totals, lengths, out=np.zeros_like(totals), where=lengths > 0)
 
-    # Score each sentence
-    scored = []
-    for i, sentence in enumerate(sentences):
-        words = re.findall(r"\b[a-z]+\b", sentence.lower())
-        if not words:
-            scored.append((0.0, i, sentence))
-            continue
+    # Boost first and last sentences slightly (often contain key info)
+    scores[0] *= 1.2
+    if len(sentences) > 1:
+        scores[-1] *= 1.1
 
-        score = sum(word_freq.get(w, 0) for w in words) / len(words)
+    return list(zip(scores.tolist(), range(len(sentences)), sentences))
 
-        # Boost first and last sentences slightly (often contain key info)
-        if i == 0:
-            score *= 1.2
-        elif i == len(sentences) - 1:
-            score *= 1.1
 
-        scored.append((score, i, sentence))
+def _score_sentences_cached(sentences: list[str]) -> list[tuple[float, int, str]]:
+    """
+    Memoized _score_sentences.
+
+    Summary and key points share one scoring pass, and re-summarizing the same
+    transcript (e.g. with a different sentence count) skips scoring entirely.
+    Entries are keyed on a digest of the sentences and hold only the scores,
+    so cached transcripts aren't kept in memory.
+    """
+    key = hashlib.blake2b("\x00".join(sentences).encode(), digest_size=16).digest()
+    with _score_cache_lock:
+        scores = _score_cache.get(key)
+        if scores is not None:
+            _score_cache.move_to_end(key)
 
-    return scored
+    if scores is None:
+        scores = [score for score, _, _ in _score_sentences(sentences)]
+        with _score_cache_lock:
+            _score_cache[key] = scores
+            if len(_score_cache) > _SCORE_CACHE_SIZE:
+                _score_cache.popitem(last=False)
 
+    return list(zip(scores, range(len(sentences)), sentences))
 
-def extract_summary(text: str, num_sentences: int = 5) -> str:
+
+def extract_summary(
+    text: str, num_sentences: int = 5, sentences: list[str] | None = None
+) -> str:
     """
     Generate an extractive summary by selecting the most important sentences.
 
     Args:
         text: The full transcript text.
         num_sentences: Number of sentences to include in summary.
+        sentences: Pre-split sentences of ``text``, if the caller already has them.
 
     Returns:
         Summary string (selected sentences in original order).
@@ -106,12 +195,13 @@ def extract_summary(text: str, num_sentences: int = 5) -> str:
     if not text or not text.strip():
         return ""
 
-    sentences = _split_sentences(text)
+    if sentences is None:
+        sentences = _split_sentences(text)
 
     if len(sentences) <= num_sentences:
         return text.strip()
 
-    scored = _score_sentences(sentences)
+    scored = _score_sentences_cached(sentences)
 
     # Select top sentences
     top = sorted(scored, key=lambda x: x[0], reverse=True)[:num_sentences]
@@ -122,7 +212,9 @@ def extract_summary(text: str, num_sentences: int = 5) -> str:
     return " ".join(s[2] for s in top_in_order)
 
 
-def extract_key_points(text: str, max_points: int = 7) -> list[str]:
+def extract_key_points(
+    text: str, max_points: int = 7, sentences: list[str] | None = None
+) -> list[str]:
     """
     Extract key points from text.
 
@@ -131,11 +223,12 @@ def extract_key_points(text: str, max_points: int = 7) -> list[str]:
     if not text or not text.strip():
         return []
 
-    sentences = _split_sentences(text)
+    if sentences is None:
+        sentences = _split_sentences(text)
     if not sentences:
         return []
 
-    scored = _score_sentences(sentences)
+    scored = _score_sentences_cached(sentences)
     top = sorted(scored, key=lambda x: x[0], reverse=True)[:max_points]
     top_in_order = sorted(top, key=lambda x: x[1])
 
@@ -150,7 +243,7 @@ def extract_key_points(text: str, max_points: int = 7) -> list[str]:
     return points
 
 
-def extract_action_items(text: str) -> list[str]:
+def extract_action_items(text: str, sentences: list[str] | None = None) -> list[str]:
     """
     Extract action items from text using pattern matching.
 
@@ -159,21 +252,20 @@ def extract_action_items(text: str) -> list[str]:
     if not text or not text.strip():
         return []
 
-    sentences = _split_sentences(text)
+    if sentences is None:
+        sentences = _split_sentences(text)
     action_items = []
     seen = set()
 
     for sentence in sentences:
-        for pattern in ACTION_PATTERNS:
-            if re.search(pattern, sentence, re.IGNORECASE):
-                # Clean up the sentence
-                item = sentence.strip().rstrip(".")
-                # Deduplicate
-                item_lower = item.lower()
-                if item_lower not in seen and len(item) > 15:
-                    seen.add(item_lower)
-                    action_items.append(item)
-                break  # Don't match same sentence with multiple patterns
+        if _ACTION_RE.search(sentence):
+            # Clean up the sentence
+            item = sentence.strip().rstrip(".")
+            # Deduplicate
+            item_lower = item.lower()
+            if item_lower not in seen and len(item) > 15:
+                seen.add(item_lower)
+                action_items.append(item)
 
     return action_items
 
@@ -206,9 +298,9 @@ def summarize_transcript(
         logger.info(f"Long transcript ({len(sentences)} sentences), using map-reduce.")
         return _map_reduce_summarize(text, sentences, num_sentences)
 
-    summary = extract_summary(text, num_sentences)
-    key_points = extract_key_points(text, max_points=7)
-    action_items = extract_action_items(text)
+    summary = extract_summary(text, num_sentences, sentences=sentences)
+    key_points = extract_key_points(text, max_points=7, sentences=sentences)
+    action_items = extract_action_items(text, sentences=sentences)
 
     return {
         "summary": summary,
@@ -223,29 +315,38 @@ def _map_reduce_summarize(
     """Map-reduce summarization for long transcripts."""
     # Split into segments of ~20 sentences
     segment_size = 20
-    segments = []
-    for i in range(0, len(sentences), segment_size):
-        segment = " ".join(sentences[i : i + segment_size])
-        segments.append(segment)
+    segments = [sentences[i : i + segment_size] for i in range(0, len(sentences), segment_size)]
 
     # Map: extract summary from each segment
-    segment_summaries = []
-    for segment in segments:
-        segment_summary = extract_summary(segment, num_sentences=3)
-        segment_summaries.append(segment_summary)
+    if _POOL_WORKERS >= 2 and len(segments) >= _PARALLEL_MIN_SEGMENTS:
+        segment_summaries = list(
+            _get_executor().map(
+                partial(_summarize_segment, num_sentences=3),
+                segments,
+                chunksize=max(1, len(segments) // (4 * _POOL_WORKERS)),
+            )
+        )
+    else:
+        segment_summaries = [_summarize_segment(segment, num_sentences=3) for segment in segments]
 
     # Reduce: summarize the combined segment summaries
     combined = " ".join(segment_summaries)
-    summary = extract_summary(combined, num_sentences)
+    combined_sentences = _split_sentences(combined)
+    summary = extract_summary(combined, num_sentences, sentences=combined_sentences)
 
     # Extract action items from full text (patterns are local)
-    action_items = extract_action_items(text)
+    action_items = extract_action_items(text, sentences=sentences)
 
     # Key points from combined summaries
-    key_points = extract_key_points(combined, max_points=7)
+    key_points = extract_key_points(combined, max_points=7, sentences=combined_sentences)
 
     return {
         "summary": summary,
         "key_points": key_points,
         "action_items": action_items,
     }
+
+
+def _summarize_segment(segment: list[str], num_sentences: int) -> str:
+    """Summarize one map-reduce segment (module-level so worker processes can run it)."""
+    return extract_summary(" ".join(segment), num_sentences=num_sentences, sentences=segment)
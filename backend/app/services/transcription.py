@@ -4,44 +4,99 @@ AssemblyAI free tier: 100 hours/month of transcription.
 Sign up at https://www.assemblyai.com/ to get an API key.
 """
 
+import asyncio
 import logging
 import time
+from typing import TYPE_CHECKING
 
-import requests
+import aiofiles
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 ASSEMBLYAI_UPLOAD_URL = "https://api.assemblyai.com/v2/upload"
 ASSEMBLYAI_TRANSCRIPT_URL = "https://api.assemblyai.com/v2/transcript"
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # 5 MB
+HTTP_TIMEOUT_SEC = 60.0  # per network operation
+
+# Poll quickly at first so short transcripts return promptly, then back off
+POLL_INITIAL_DELAY_SEC = 0.25
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY_SEC = 10.0
+
+_MOCK_RESULT = {
+    "text": (
+        "Welcome to the VoiceAid demo session. "
+        "Today we need to discuss the project timeline and assign tasks. "
+        "First, we should finalize the design mockups by Friday. "
+        "Sarah will handle the frontend implementation. "
+        "We need to set up the CI/CD pipeline before next week. "
+        "Action item: John should review the API documentation. "
+        "Action item: Schedule a follow-up meeting for Monday. "
+        "The budget needs to be approved by the finance team. "
+        "Let's make sure we have unit tests for all critical paths. "
+        "Thanks everyone for joining today's meeting."
+    ),
+    "language": "en",
+}
+
+# The app's shared HTTP client: uploads, requests and polls of every
+# transcription reuse pooled keep-alive connections instead of a fresh
+# TCP + TLS handshake per call. It belongs to the server's event loop; created
+# on first use, closed on app shutdown. Mock mode never imports httpx.
+_client: "httpx.AsyncClient | None" = None
+
+
+def _new_client() -> "httpx.AsyncClient":
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT_SEC, limits=httpx.Limits(max_keepalive_connections=16)
+    )
+
+
+def _get_client() -> "httpx.AsyncClient":
+    """Return the shared AssemblyAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = _new_client()
+    return _client
+
+
+def _auth_headers() -> dict:
+    return {"authorization": settings.assemblyai_api_key}
+
+
+async def close_client():
+    """Close the shared AssemblyAI client, if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 def _mock_transcribe(audio_path: str) -> dict:
     """Return a mock transcript for development/testing."""
-    return {
-        "text": (
-            "Welcome to the VoiceAid demo session. "
-            "Today we need to discuss the project timeline and assign tasks. "
-            "First, we should finalize the design mockups by Friday. "
-            "Sarah will handle the frontend implementation. "
-            "We need to set up the CI/CD pipeline before next week. "
-            "Action item: John should review the API documentation. "
-            "Action item: Schedule a follow-up meeting for Monday. "
-            "The budget needs to be approved by the finance team. "
-            "Let's make sure we have unit tests for all critical paths. "
-            "Thanks everyone for joining today's meeting."
-        ),
-        "language": "en",
-    }
+    return dict(_MOCK_RESULT)
 
 
-def _upload_to_assemblyai(audio_path: str) -> str:
-    """Upload a local audio file to AssemblyAI and return the upload URL."""
-    headers = {"authorization": settings.assemblyai_api_key}
+async def _read_file_chunks(audio_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield a file's content in fixed-size chunks."""
+    async with aiofiles.open(audio_path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
 
-    with open(audio_path, "rb") as f:
-        response = requests.post(ASSEMBLYAI_UPLOAD_URL, headers=headers, data=f)
+
+async def _upload_to_assemblyai(client: "httpx.AsyncClient", audio_path: str) -> str:
+    """Upload a local audio file to AssemblyAI and return the upload URL."""
+    # A generator body is sent with chunked transfer encoding as it is read
+    response = await client.post(
+        ASSEMBLYAI_UPLOAD_URL, headers=_auth_headers(), content=_read_file_chunks(audio_path)
+    )
 
     if response.status_code != 200:
         raise RuntimeError(f"AssemblyAI upload failed ({response.status_code}): {response.text}")
@@ -49,12 +104,10 @@ def _upload_to_assemblyai(audio_path: str) -> str:
     return response.json()["upload_url"]
 
 
-def _request_transcription(audio_url: str, language: str | None = None) -> str:
+async def _request_transcription(
+    client: "httpx.AsyncClient", audio_url: str, language: str | None = None
+) -> str:
     """Request transcription and return the transcript ID."""
-    headers = {
-        "authorization": settings.assemblyai_api_key,
-        "content-type": "application/json",
-    }
     payload: dict = {"audio_url": audio_url}
 
     if language:
@@ -62,7 +115,7 @@ def _request_transcription(audio_url: str, language: str | None = None) -> str:
     else:
         payload["language_detection"] = True
 
-    response = requests.post(ASSEMBLYAI_TRANSCRIPT_URL, headers=headers, json=payload)
+    response = await client.post(ASSEMBLYAI_TRANSCRIPT_URL, headers=_auth_headers(), json=payload)
 
     if response.status_code != 200:
         raise RuntimeError(
@@ -72,35 +125,51 @@ def _request_transcription(audio_url: str, language: str | None = None) -> str:
     return response.json()["id"]
 
 
-def _poll_transcript(transcript_id: str, timeout_sec: int = 300) -> dict:
+async def _poll_transcript(
+    client: "httpx.AsyncClient", transcript_id: str, timeout_sec: int = 300
+) -> dict:
     """Poll AssemblyAI until the transcript is ready."""
-    headers = {"authorization": settings.assemblyai_api_key}
     url = f"{ASSEMBLYAI_TRANSCRIPT_URL}/{transcript_id}"
 
-    start = time.time()
-    while time.time() - start < timeout_sec:
-        response = requests.get(url, headers=headers)
-        data = response.json()
+    delay = POLL_INITIAL_DELAY_SEC
+    polls = 0
+    deadline = time.monotonic() + timeout_sec
+    while True:
+        data = (await client.get(url, headers=_auth_headers())).json()
+        polls += 1
 
         if data["status"] == "completed":
             return data
         elif data["status"] == "error":
             raise RuntimeError(f"AssemblyAI transcription error: {data.get('error', 'unknown')}")
 
-        logger.info(f"Transcription status: {data['status']}... waiting 3s")
-        time.sleep(3)
+        # Log every fifth poll; early polls are frequent
+        if polls % 5 == 0:
+            logger.info(f"Transcription status: {data['status']} after {polls} polls")
+        # Never sleep past the deadline; the last poll happens right at it
+        sleep_sec = min(delay, deadline - time.monotonic())
+        if sleep_sec <= 0:
+            break
+        await asyncio.sleep(sleep_sec)
+        delay = min(POLL_MAX_DELAY_SEC, delay * POLL_BACKOFF_FACTOR)
 
     raise RuntimeError(f"Transcription timed out after {timeout_sec}s")
 
 
-def transcribe_audio(audio_path: str) -> dict:
+async def transcribe_audio_async(
+    audio_path: str, timeout_sec: int = 300, client: "httpx.AsyncClient | None" = None
+) -> dict:
     """
     Transcribe an audio file to text using AssemblyAI.
 
-    In mock mode, returns a fixed demo transcript (no API call).
+    In mock mode, returns a fixed demo transcript (no API call). Waits
+    between polls with asyncio.sleep, so a transcription in progress
+    occupies no thread.
 
     Args:
         audio_path: Path to the audio file.
+        timeout_sec: How long to wait for AssemblyAI to finish.
+        client: HTTP client to use; defaults to the app's shared client.
 
     Returns:
         dict with keys: 'text' (str), 'language' (str)
@@ -115,14 +184,16 @@ def transcribe_audio(audio_path: str) -> dict:
             "Get a free key at https://www.assemblyai.com/ and add it to your .env file."
         )
 
+    client = client or _get_client()
+
     logger.info(f"Uploading audio to AssemblyAI: {audio_path}")
-    audio_url = _upload_to_assemblyai(audio_path)
+    audio_url = await _upload_to_assemblyai(client, audio_path)
 
     logger.info("Requesting transcription...")
-    transcript_id = _request_transcription(audio_url, settings.whisper_language)
+    transcript_id = await _request_transcription(client, audio_url, settings.whisper_language)
 
     logger.info(f"Polling for transcript {transcript_id}...")
-    result = _poll_transcript(transcript_id)
+    result = await _poll_transcript(client, transcript_id, timeout_sec)
 
     detected_language = result.get("language_code", "en")
     text = result.get("text", "") or ""
@@ -133,3 +204,28 @@ def transcribe_audio(audio_path: str) -> dict:
         "text": text,
         "language": detected_language,
     }
+
+
+async def transcribe_batch(audio_paths: list[str], max_concurrent: int = 5) -> list:
+    """
+    Transcribe several files concurrently.
+
+    At most ``max_concurrent`` transcriptions are in flight at once. The
+    batch uses its own HTTP client, closed when it finishes, so it can be run
+    from any event loop (e.g. repeated ``asyncio.run`` calls in a script).
+
+    Returns:
+        One entry per path, in order: the transcribe_audio_async result dict,
+        or the exception raised for that file.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async with _new_client() as client:
+
+        async def _transcribe(audio_path: str) -> dict:
+            async with semaphore:
+                return await transcribe_audio_async(audio_path, client=client)
+
+        return await asyncio.gather(
+            *(_transcribe(path) for path in audio_paths), return_exceptions=True
+        )
@@ -1,67 +1,87 @@
 """Pytest fixtures for backend tests."""
 
 import os
-import struct
 import wave
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 # Force mock mode for tests
 os.environ["MOCK_MODE"] = "true"
 
 
-@pytest.fixture(scope="function")
-def client(tmp_path):
-    """FastAPI test client with a fresh test database per test."""
-    db_path = tmp_path / "test.db"
+@pytest.fixture(scope="session")
+def _app_client(tmp_path_factory):
+    """FastAPI test client and test database, set up once for the whole run."""
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
     db_url = f"sqlite:///{db_path}"
 
-    engine = create_engine(db_url, connect_args={"check_same_thread": False})
-    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    # Patch the database module BEFORE importing the app
     import app.database as db_mod
-    original_engine = db_mod.engine
-    original_session_local = db_mod.SessionLocal
 
-    db_mod.engine = engine
-    db_mod.SessionLocal = TestingSession
+    engine = db_mod.configure_engine(
+        create_engine(db_url, connect_args={"check_same_thread": False})
+    )
+    async_engine = db_mod.configure_engine(create_async_engine(db_mod._async_url(db_url)))
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingAsyncSession = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
-    from app.database import Base, get_db
+    # Patch the database module BEFORE importing the app
+    patched = {
+        "engine": engine,
+        "SessionLocal": TestingSession,
+        "async_write_engine": async_engine,
+        "async_read_engine": async_engine,
+        "AsyncWriteSessionLocal": TestingAsyncSession,
+        "AsyncReadSessionLocal": TestingAsyncSession,
+    }
+    originals = {name: getattr(db_mod, name) for name in patched}
+    for name, value in patched.items():
+        setattr(db_mod, name, value)
+
+    from app.database import Base
     from app.main import app
 
     # Create tables
     Base.metadata.create_all(bind=engine)
 
-    def override_get_db():
-        db = TestingSession()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-
     from fastapi.testclient import TestClient
     with TestClient(app) as c:
         yield c
 
-    app.dependency_overrides.clear()
-    db_mod.engine = original_engine
-    db_mod.SessionLocal = original_session_local
+    for name, value in originals.items():
+        setattr(db_mod, name, value)
+    engine.dispose()
 
 
 @pytest.fixture
-def sample_wav(tmp_path):
-    """Create a minimal valid WAV file for testing."""
-    wav_path = tmp_path / "test.wav"
+def client(_app_client):
+    """The shared test client, with every table emptied after each test.
+
+    Handlers and the processing worker use several connections, so a
+    per-test rollback can't isolate them; deleting the rows can (the FTS
+    index follows through its triggers).
+    """
+    yield _app_client
+
+    from app import database
+
+    with database.engine.begin() as conn:
+        for table in reversed(database.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def sample_wav(tmp_path_factory):
+    """Create a minimal valid WAV file for testing (read-only, shared by all tests)."""
+    wav_path = tmp_path_factory.mktemp("wavs") / "test.wav"
     with wave.open(str(wav_path), "w") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(16000)
         # 1 second of silence
-        frames = struct.pack("<" + "h" * 16000, *([0] * 16000))
-        wf.writeframes(frames)
+        wf.writeframes(b"\x00\x00" * 16000)
     return str(wav_path)
@@ -14,20 +14,54 @@ def test_health_check(client):
 
 
 def test_upload_session(client, sample_wav):
-    """Upload a WAV file and get a transcribed session back."""
+    """Upload a WAV file; it is accepted and processed in the background."""
     with open(sample_wav, "rb") as f:
         resp = client.post(
             "/api/sessions",
             files={"file": ("test.wav", f, "audio/wav")},
         )
-    assert resp.status_code == 201
+    assert resp.status_code == 202
+    data = resp.json()
+    assert data["id"]
+    assert data["status"] == "uploading"
+    assert data["audio_duration"] == 1.0  # read from the upload stream
+
+    # TestClient runs background tasks before returning, so processing is done
+    resp = client.get(f"/api/sessions/{data['id']}")
     data = resp.json()
     assert data["status"] == "completed"
     assert data["transcript"]  # Should have mock transcript
     assert data["summary"]
     assert isinstance(data["key_points"], list)
     assert isinstance(data["action_items"], list)
-    assert data["id"]
+
+
+def test_upload_duplicate_reuses_results(client, sample_wav, monkeypatch):
+    """Re-uploading identical audio copies the earlier results without reprocessing."""
+    import app.services.processing as processing
+
+    with open(sample_wav, "rb") as f:
+        first_id = client.post(
+            "/api/sessions", files={"file": ("test.wav", f, "audio/wav")}
+        ).json()["id"]
+    first = client.get(f"/api/sessions/{first_id}").json()
+
+    async def fail(audio_path):
+        raise AssertionError("duplicate upload should not be transcribed")
+
+    monkeypatch.setattr(processing, "transcribe_audio_async", fail)
+
+    with open(sample_wav, "rb") as f:
+        resp = client.post("/api/sessions", files={"file": ("again.wav", f, "audio/wav")})
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["id"] != first_id
+    assert data["status"] == "completed"
+    assert data["transcript"] == first["transcript"]
+    assert data["key_points"] == first["key_points"]
+
+    responses = client.get("/openapi.json").json()["paths"]["/api/sessions"]["post"]["responses"]
+    assert {"201", "202"} <= responses.keys()
 
 
 def test_upload_invalid_format(client):
@@ -40,6 +74,19 @@ def test_upload_invalid_format(client):
     assert "Unsupported" in resp.json()["detail"]
 
 
+def test_upload_too_large(client, sample_wav, monkeypatch):
+    """Uploads over the size limit are rejected and not kept on disk."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "max_file_size_mb", 0)
+    before = set(settings.upload_dir.iterdir())
+
+    with open(sample_wav, "rb") as f:
+        resp = client.post("/api/sessions", files={"file": ("test.wav", f, "audio/wav")})
+    assert resp.status_code == 413
+    assert set(settings.upload_dir.iterdir()) == before
+
+
 def test_list_sessions_empty(client):
     """List sessions when none exist."""
     resp = client.get("/api/sessions")
@@ -61,6 +108,26 @@ def test_list_sessions_with_data(client, sample_wav):
     assert len(data["sessions"]) == 1
 
 
+def test_list_sessions_keyset_pagination(client, sample_wav):
+    """Paging with an (after_created_at, after_id) cursor walks every session once."""
+    for _ in range(3):
+        with open(sample_wav, "rb") as f:
+            client.post("/api/sessions", files={"file": ("test.wav", f, "audio/wav")})
+
+    first = client.get("/api/sessions", params={"page_size": 2}).json()
+    assert len(first["sessions"]) == 2
+    last = first["sessions"][-1]
+
+    second = client.get(
+        "/api/sessions",
+        params={"page_size": 2, "after_created_at": last["created_at"], "after_id": last["id"]},
+    ).json()
+    assert len(second["sessions"]) == 1
+
+    ids = [s["id"] for s in first["sessions"] + second["sessions"]]
+    assert len(set(ids)) == 3
+
+
 def test_get_session_detail(client, sample_wav):
     """Get a specific session by ID."""
     with open(sample_wav, "rb") as f:
@@ -114,6 +181,24 @@ def test_search_sessions(client, sample_wav):
     assert data["total"] == 0
 
 
+def test_search_sessions_prefix_and_delete(client, sample_wav):
+    """Search matches word prefixes and forgets deleted sessions."""
+    with open(sample_wav, "rb") as f:
+        create_resp = client.post("/api/sessions", files={"file": ("test.wav", f, "audio/wav")})
+    session_id = create_resp.json()["id"]
+
+    resp = client.get("/api/sessions", params={"search": "finaliz mockups"})
+    assert resp.json()["total"] == 1
+
+    # Quotes and FTS operators in user input are treated as plain text
+    resp = client.get("/api/sessions", params={"search": 'budget" OR "x'})
+    assert resp.status_code == 200
+
+    client.delete(f"/api/sessions/{session_id}")
+    resp = client.get("/api/sessions", params={"search": "mockups"})
+    assert resp.json()["total"] == 0
+
+
 def test_resummarize_session(client, sample_wav):
     """Re-summarize with different sentence count."""
     with open(sample_wav, "rb") as f:
@@ -129,3 +214,101 @@ def test_resummarize_session(client, sample_wav):
     assert resp.status_code == 200
     data = resp.json()
     assert data["summary"]
+
+
+def test_slow_steps_run_without_the_write_lock(client, sample_wav, monkeypatch):
+    """Upload streaming and re-summarization must not hold the single writer."""
+    import app.database as db_mod
+    import app.routers.sessions as sessions_router
+
+    lock_held = []
+    save_upload = sessions_router._save_upload
+    summarize = sessions_router.summarize_transcript
+
+    async def checked_save_upload(*args):
+        lock_held.append(db_mod._write_lock.locked())
+        return await save_upload(*args)
+
+    def checked_summarize(*args, **kwargs):
+        lock_held.append(db_mod._write_lock.locked())
+        return summarize(*args, **kwargs)
+
+    monkeypatch.setattr(sessions_router, "_save_upload", checked_save_upload)
+    monkeypatch.setattr(sessions_router, "summarize_transcript", checked_summarize)
+
+    with open(sample_wav, "rb") as f:
+        session_id = client.post(
+            "/api/sessions", files={"file": ("test.wav", f, "audio/wav")}
+        ).json()["id"]
+    client.post(f"/api/sessions/{session_id}/resummarize", json={"sentence_count": 2})
+
+    assert lock_held == [False, False]
+
+
+def test_timestamps_formatted_alike_across_endpoints(client, sample_wav):
+    """POST, GET, list and resummarize return timestamps in the same form."""
+    with open(sample_wav, "rb") as f:
+        created = client.post("/api/sessions", files={"file": ("test.wav", f, "audio/wav")}).json()
+    session_id = created["id"]
+
+    fetched = client.get(f"/api/sessions/{session_id}").json()
+    listed = client.get("/api/sessions").json()["sessions"][0]
+    resummarized = client.post(
+        f"/api/sessions/{session_id}/resummarize", json={"sentence_count": 2}
+    ).json()
+
+    assert created["created_at"] == fetched["created_at"] == listed["created_at"]
+    assert resummarized["created_at"] == fetched["created_at"]
+    refetched = client.get(f"/api/sessions/{session_id}").json()
+    assert resummarized["updated_at"] == refetched["updated_at"]
+
+
+def test_database_uses_wal(client):
+    """SQLite connections should be opened in WAL mode."""
+    from sqlalchemy import text
+
+    import app.database as db_mod
+
+    with db_mod.engine.connect() as conn:
+        mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+    assert mode == "wal"
+
+
+def test_upload_processing_error(client, sample_wav, monkeypatch):
+    """A failing pipeline marks the session as errored."""
+    import app.services.processing as processing
+
+    async def fail(audio_path):
+        raise RuntimeError("transcriber exploded")
+
+    monkeypatch.setattr(processing, "transcribe_audio_async", fail)
+
+    with open(sample_wav, "rb") as f:
+        create_resp = client.post("/api/sessions", files={"file": ("test.wav", f, "audio/wav")})
+    session_id = create_resp.json()["id"]
+
+    data = client.get(f"/api/sessions/{session_id}").json()
+    assert data["status"] == "error"
+    assert "transcriber exploded" in data["error_message"]
+
+
+def test_interrupted_sessions_marked_errored_on_startup(client):
+    """Sessions stuck mid-pipeline from a previous run are failed, finished ones kept."""
+    import app.database as db_mod
+    from app.models import Session
+
+    with db_mod.SessionLocal() as db:
+        db.add_all(
+            [
+                Session(id="stuck-upload", status="uploading"),
+                Session(id="stuck-transcribe", status="transcribing"),
+                Session(id="done", status="completed"),
+            ]
+        )
+        db.commit()
+
+    assert db_mod.fail_interrupted_sessions() == 2
+
+    assert client.get("/api/sessions/stuck-transcribe").json()["status"] == "error"
+    assert client.get("/api/sessions/stuck-upload").json()["error_message"]
+    assert client.get("/api/sessions/done").json()["status"] == "completed"
@@ -1,5 +1,12 @@
 """Unit tests for core service functions."""
 
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.services.audio import get_audio_duration, get_audio_duration_from_bytes
 from app.services.summarization import (
     _split_sentences,
     extract_action_items,
@@ -113,8 +120,194 @@ class TestSummarizeTranscript:
         assert len(result["summary"]) > 0
         assert len(result["action_items"]) > 0
 
+    def test_resummarize_reuses_scores(self, monkeypatch):
+        import app.services.summarization as summarization
+
+        calls = []
+        original = summarization._score_sentences
+        monkeypatch.setattr(
+            summarization, "_score_sentences", lambda s: calls.append(1) or original(s)
+        )
+
+        text = " ".join(f"Sentence number {i} talks about caching scores." for i in range(12))
+        first = summarize_transcript(text, num_sentences=3)
+        second = summarize_transcript(text, num_sentences=5)
+
+        assert len(calls) <= 1
+        assert first["summary"] != second["summary"]
+
     def test_empty_input(self):
         result = summarize_transcript("")
         assert result["summary"] == ""
         assert result["key_points"] == []
         assert result["action_items"] == []
+
+
+class TestGetAudioDuration:
+    def test_wav_duration(self, sample_wav):
+        assert get_audio_duration(sample_wav) == 1.0
+
+    def test_wav_duration_from_header_prefix(self, sample_wav):
+        with open(sample_wav, "rb") as f:
+            data = f.read()
+        assert get_audio_duration_from_bytes(data, ".wav") == 1.0
+        assert get_audio_duration_from_bytes(data[:100], ".wav", total_size=len(data)) == 1.0
+
+    def test_truncated_bytes_not_trusted_without_header_length(self, sample_wav):
+        with open(sample_wav, "rb") as f:
+            data = f.read()
+        assert get_audio_duration_from_bytes(data[:100], ".mp3", total_size=len(data)) == 0.0
+
+    def test_unreadable_file(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("not audio")
+        assert get_audio_duration(str(path)) == 0.0
+
+
+class TestMapReduce:
+    def test_parallel_matches_serial(self, monkeypatch):
+        import app.services.summarization as summarization
+
+        words = "project budget deadline design review release customer testing".split()
+        text = " ".join(
+            f"The {words[i % 8]} team discussed {words[(i * 3) % 8]} item {i}." for i in range(120)
+        )
+        serial = summarize_transcript(text)
+
+        monkeypatch.setattr(summarization, "_PARALLEL_MIN_SEGMENTS", 2)
+        monkeypatch.setattr(summarization, "_POOL_WORKERS", 2)
+        try:
+            parallel = summarize_transcript(text)
+        finally:
+            summarization.shutdown_executor()
+
+        assert parallel == serial
+
+    def test_single_cpu_stays_serial(self, monkeypatch):
+        import app.services.summarization as summarization
+
+        text = " ".join(f"The team reviewed item number {i} today." for i in range(700))
+        monkeypatch.setattr(summarization, "_POOL_WORKERS", 1)
+        monkeypatch.setattr(summarization, "_PARALLEL_MIN_SEGMENTS", 2)
+        monkeypatch.setattr(summarization, "_get_executor", lambda: pytest.fail("pool used"))
+
+        assert summarize_transcript(text)["summary"]
+
+
+class TestTranscribeAudioAsync:
+    """The AssemblyAI HTTP flow, against an httpx.MockTransport."""
+
+    @pytest.fixture
+    def assemblyai(self, monkeypatch, tmp_path):
+        import httpx
+
+        import app.services.transcription as transcription
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "mock_mode", False)
+        monkeypatch.setattr(settings, "assemblyai_api_key", "test-key")
+        monkeypatch.setattr(transcription, "POLL_INITIAL_DELAY_SEC", 0.001)
+
+        audio_path = tmp_path / "talk.wav"
+        audio_path.write_bytes(b"RIFF" + b"\x01" * 100_000)
+
+        api = {"statuses": ["queued", "processing", "completed"], "requests": []}
+
+        def handler(request):
+            api["requests"].append(request)
+            assert request.headers["authorization"] == "test-key"
+            if request.url.path == "/v2/upload":
+                api["uploaded"] = request.read()
+                return httpx.Response(200, json={"upload_url": "https://cdn/talk"})
+            if request.method == "POST":
+                api["payload"] = json.loads(request.content)
+                return httpx.Response(200, json={"id": "t1"})
+            status = api["statuses"].pop(0) if len(api["statuses"]) > 1 else api["statuses"][0]
+            return httpx.Response(
+                200,
+                json={
+                    "status": status,
+                    "text": "Hello there.",
+                    "language_code": "en",
+                    "error": "bad audio",
+                },
+            )
+
+        api["audio_path"] = str(audio_path)
+        monkeypatch.setattr(
+            transcription,
+            "_new_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(transcription, "_client", None)
+        yield api
+        asyncio.run(transcription.close_client())
+
+    def test_upload_submit_poll(self, assemblyai):
+        from app.services.transcription import transcribe_audio_async
+
+        result = asyncio.run(transcribe_audio_async(assemblyai["audio_path"]))
+
+        assert result == {"text": "Hello there.", "language": "en"}
+        assert assemblyai["uploaded"] == b"RIFF" + b"\x01" * 100_000
+        assert assemblyai["payload"] == {
+            "audio_url": "https://cdn/talk",
+            "language_detection": True,
+        }
+        polls = [r for r in assemblyai["requests"] if r.method == "GET"]
+        assert len(polls) == 3
+
+    def test_transcript_error(self, assemblyai):
+        from app.services.transcription import transcribe_audio_async
+
+        assemblyai["statuses"] = ["processing", "error"]
+        with pytest.raises(RuntimeError, match="bad audio"):
+            asyncio.run(transcribe_audio_async(assemblyai["audio_path"]))
+
+    def test_timeout(self, assemblyai, monkeypatch):
+        import app.services.transcription as transcription
+        from app.services.transcription import transcribe_audio_async
+
+        assemblyai["statuses"] = ["processing"]
+        # A backoff delay far beyond the timeout must be cut short at the deadline
+        monkeypatch.setattr(transcription, "POLL_INITIAL_DELAY_SEC", 5.0)
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="timed out"):
+            asyncio.run(transcribe_audio_async(assemblyai["audio_path"], timeout_sec=0.05))
+        assert time.monotonic() - start < 1.0
+
+    def test_batch_runs_on_fresh_event_loops(self, assemblyai):
+        from app.services.transcription import transcribe_batch
+
+        assemblyai["statuses"] = ["completed"]
+        paths = [assemblyai["audio_path"]] * 3
+        for _ in range(2):
+            results = asyncio.run(transcribe_batch(paths))
+            assert results == [{"text": "Hello there.", "language": "en"}] * 3
+
+
+class TestTranscribeBatch:
+    def test_bounded_concurrency_and_partial_failure(self, monkeypatch):
+        import app.services.transcription as transcription
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_transcribe(audio_path, client=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if audio_path == "bad.wav":
+                raise RuntimeError("upload failed")
+            return {"text": audio_path, "language": "en"}
+
+        monkeypatch.setattr(transcription, "transcribe_audio_async", fake_transcribe)
+
+        paths = [f"{i}.wav" for i in range(6)] + ["bad.wav"]
+        results = asyncio.run(transcription.transcribe_batch(paths, max_concurrent=2))
+
+        assert peak == 2
+        assert [r["text"] for r in results[:6]] == paths[:6]
+        assert isinstance(results[6], RuntimeError)
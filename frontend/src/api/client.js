@@ -31,17 +31,50 @@ async function handleResponse(response) {
   return response.json();
 }
 
+const POLL_INTERVAL_MS = 1000;
+// Give up eventually: a backend restart mid-pipeline can leave a session unfinished
+const MAX_WAIT_MS = 10 * 60 * 1000;
+const FINAL_STATUSES = ["completed", "error"];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 const api = {
-  /** Upload audio file and process it. Returns the full session object. */
-  async createSession(file) {
+  /**
+   * Upload audio file and process it. The backend processes uploads in the
+   * background, so this polls until the session is finished.
+   * Returns the full session object. `options` are passed to waitForSession.
+   */
+  async createSession(file, options = {}) {
     const formData = new FormData();
     formData.append("file", file);
 
     const response = await fetch(`${BASE_URL}/api/sessions`, {
       method: "POST",
       body: formData,
+      signal: options.signal,
     });
-    return handleResponse(response);
+    const session = await handleResponse(response);
+    return api.waitForSession(session.id, options);
+  },
+
+  /**
+   * Poll a session until it is completed or errored.
+   * Throws an ApiError once `maxWaitMs` has passed or `signal` is aborted.
+   */
+  async waitForSession(
+    id,
+    { intervalMs = POLL_INTERVAL_MS, maxWaitMs = MAX_WAIT_MS, signal } = {},
+  ) {
+    const deadline = Date.now() + maxWaitMs;
+    for (;;) {
+      if (signal?.aborted) throw new ApiError("Processing was cancelled.", 0);
+      const session = await api.getSession(id);
+      if (FINAL_STATUSES.includes(session.status)) return session;
+      if (Date.now() + intervalMs > deadline) {
+        throw new ApiError("Processing is taking too long. Please try again later.", 0);
+      }
+      await sleep(intervalMs);
+    }
   },
 
   /** List sessions with optional search and pagination. */